@@ -1,41 +1,207 @@
 import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from concurrent.futures import Future
+import httpx
 from openai import OpenAI
 import replicate
+from queue_manager import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+CACHE_TTL = 3600  # Cached completions expire after 1 hour
+CACHE_MAX_ENTRIES = 1024
+# Hit/miss counters live in Redis so lookups made in worker processes show up
+# on the dashboard served by the web process
+CACHE_HITS_KEY = "cachestats:hits"
+CACHE_MISSES_KEY = "cachestats:misses"
+
+HTTP_LIMITS = httpx.Limits(
+    max_keepalive_connections=20,
+    max_connections=100,
+    keepalive_expiry=30.0
+)
+
+# Shared keep-alive pool for OpenAI calls and generated image downloads
+http_client = httpx.Client(
+    limits=HTTP_LIMITS,
+    timeout=httpx.Timeout(30.0),
+    follow_redirects=True
+)
+
+# Kept byte-identical across calls so OpenAI's automatic prefix caching can reuse it
+CLASSIFY_SYSTEM_PROMPT = (
+    "Decide whether the request is best answered with an image or a text reply, "
+    "then produce that reply. Respond with JSON containing \"type\" "
+    "(\"image\" or \"text\"), \"text\" (the reply, under 280 characters, "
+    "when type is text) and \"image_prompt\" (a short description of the image "
+    "to generate, when type is image)"
+)
+
+JSON_RESPONSE_FORMAT = {"type": "json_object"}
+
+class CacheStats:
+    """Hit/miss counters for the completion cache, shared by all processes through Redis"""
+    def record(self, hit):
+        try:
+            get_redis_connection().incr(CACHE_HITS_KEY if hit else CACHE_MISSES_KEY)
+        except Exception as e:
+            # Losing a counter bump is not worth failing the completion for
+            logger.error(f"Error recording cache stats: {str(e)}")
+
+    def to_dict(self):
+        hits, misses = get_redis_connection().mget(CACHE_HITS_KEY, CACHE_MISSES_KEY)
+        return {"cache_hits": int(hits or 0), "cache_misses": int(misses or 0)}
+
+class ResponseCache:
+    """In-memory TTL cache keyed on a SHA256 of the request parameters"""
+    def __init__(self, ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts):
+        payload = json.dumps(parts, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+        self.stats.record(entry is not None)
+        return entry[1] if entry is not None else None
+
+    def peek(self, key):
+        # Same lookup as get, but not counted in the hit/miss stats
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                return None
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.max_entries:
+                # Dicts keep insertion order, so the first key is the oldest entry
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+
+class SingleFlight:
+    """Coalesces concurrent identical calls so only one reaches the API"""
+    def __init__(self):
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            future = self._inflight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._inflight[key] = future
+        if not is_leader:
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
 
 class OpenAIClient:
     def __init__(self):
         # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
         # do not change this unless explicitly requested by the user
         self.model = "gpt-4o"
-        self.client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+        self.client = OpenAI(
+            api_key=os.environ.get("OPENAI_API_KEY"),
+            http_client=http_client
+        )
+        self.cache = ResponseCache()
+        self._inflight = SingleFlight()
 
-    def generate_text(self, prompt):
+    def _create_completion(self, messages, params):
         response = self.client.chat.completions.create(
             model=self.model,
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=280  # Twitter length limit
+            messages=messages,
+            **params
         )
         return response.choices[0].message.content
 
-    def analyze_content(self, prompt):
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[{
-                "role": "system",
-                "content": "Analyze the content and respond with JSON indicating if it needs an image or text response"
-            }, {
-                "role": "user",
-                "content": prompt
-            }],
-            response_format={"type": "json_object"}
+    def _complete(self, messages, use_cache=True, **params):
+        if not use_cache:
+            return self._create_completion(messages, params)
+
+        key = ResponseCache.make_key(self.model, messages, params)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        # Identical requests already in flight share that call's result
+        return self._inflight.do(key, self._create_and_cache, key, messages, params)
+
+    def _create_and_cache(self, key, messages, params):
+        # Runs as the single-flight leader, so the result is cached before the
+        # in-flight entry is released. A caller that missed the cache just
+        # before the previous leader finished finds the result here.
+        cached = self.cache.peek(key)
+        if cached is not None:
+            return cached
+        content = self._create_completion(messages, params)
+        self.cache.set(key, content)
+        return content
+
+    @staticmethod
+    def _build_messages(prompt, *system_prompts):
+        messages = [{"role": "system", "content": text} for text in system_prompts if text]
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
+    def generate_text(self, prompt, use_cache=True, system_prompt=None, context=None):
+        return self._complete(
+            self._build_messages(prompt, system_prompt, context),
+            use_cache=use_cache,
+            max_tokens=280  # Twitter length limit
         )
-        return response.choices[0].message.content
+
+    def classify_and_generate(self, prompt, system_prompt=None, context=None):
+        # Static instructions go first, then the slowly changing context and
+        # the tweet last, so calls share the longest possible cached prefix
+        content = self._complete(
+            self._build_messages(prompt, CLASSIFY_SYSTEM_PROMPT, system_prompt, context),
+            response_format=JSON_RESPONSE_FORMAT,
+            max_tokens=400
+        )
+        return json.loads(content)
 
 class ReplicateClient:
     def __init__(self):
-        self.client = replicate.Client(api_token=os.environ.get("REPLICATE_API_TOKEN"))
+        # Replicate needs its own auth headers and base URL, so it gets a
+        # dedicated transport with the same pool limits
+        self.client = replicate.Client(
+            api_token=os.environ.get("REPLICATE_API_TOKEN"),
+            transport=httpx.HTTPTransport(limits=HTTP_LIMITS)
+        )
+        self._inflight = SingleFlight()
 
     def generate_image(self, prompt):
+        key = ResponseCache.make_key("generate_image", prompt)
+        return self._inflight.do(key, self._run_model, prompt)
+
+    def _run_model(self, prompt):
         output = self.client.run(
             "stability-ai/stable-diffusion:db21e45d3f7023abc2a46ee38a23973f6dce16bb082a930b0c49861f96d1e5bf",
             input={
@@ -1,17 +1,15 @@
 import os
 from flask import Flask, render_template
-from database import db
+from database import db, ENGINE_OPTIONS
 from queue_manager import init_queue
 from bot import TwitterBot
+import metrics
 
 def create_app():
     app = Flask(__name__)
     app.secret_key = os.environ.get("FLASK_SECRET_KEY") or "a secret key"
     app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL")
-    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
-        "pool_recycle": 300,
-        "pool_pre_ping": True,
-    }
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = ENGINE_OPTIONS
     db.init_app(app)
     return app
 
@@ -19,6 +17,7 @@ app = create_app()
 
 # Initialize bot instance
 bot = TwitterBot()
+metrics.start_flusher(app)
 queue = init_queue()
 
 @app.route('/')
@@ -1,34 +1,113 @@
 import os
+import re
 import time
 import logging
 import threading
 import json
-from datetime import datetime
-import requests
+import tempfile
+from datetime import datetime, timedelta, timezone
 import tweepy
+from rq import Queue
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from models import Interaction, BotMetrics
 from database import db
-from api_clients import OpenAIClient, ReplicateClient
-from queue_manager import init_queue
+from api_clients import OpenAIClient, ReplicateClient, http_client
+from queue_manager import init_queue, MENTION_QUEUE, POST_QUEUE
+from dedup import already_seen, forget as forget_seen
+from job_history import JOB_OPTIONS
+import tasks
+from metrics import METRICS_ROW_ID, increment as increment_metrics, pending_counts
 
 logger = logging.getLogger(__name__)
 
+# Static reply instructions, sent ahead of the tweet so the prompt prefix is
+# identical on every call and can be served from OpenAI's prompt cache
+SYSTEM_PROMPT_REPLY = """You are replying to a tweet in an ongoing conversation.
+Considering the context of our previous interactions,
+generate a friendly and engaging reply that maintains continuity
+of the conversation. Keep it under 280 characters."""
+
+SYSTEM_PROMPT_MENTION = """Someone mentioned you in a tweet.
+Generate an appropriate response that's helpful and engaging.
+Consider the context of any previous interactions.
+Keep it under 280 characters."""
+
+POST_PROMPT = """Generate an engaging tweet about technology, AI, art, or creativity. 
+        The tweet should be informative, witty, and encourage interaction. 
+        Keep it under 280 characters and make it conversational. 
+        Include relevant hashtags where appropriate."""
+
+# Per-tweet user messages, formatted with the tweet content
+REPLY_PROMPT_TEMPLATE = 'Given this tweet: "{content}"'
+MENTION_PROMPT_TEMPLATE = 'Someone mentioned me in this tweet: "{content}"'
+
+# Tweets that explicitly ask for a picture are classified locally, skipping the
+# OpenAI round-trip. A drawing verb must be followed directly by an image noun,
+# so figurative uses ("draw us closer", "paint a grim picture", "show me how")
+# do not match; anything else goes to classify-and-generate
+IMAGE_REQUEST_PATTERN = re.compile(
+    r"\b(draw|sketch|make|create|generate|show) (me |us )?(an? |some )?"
+    r"(image|picture|pic|drawing|painting|sketch|portrait)s?\b",
+    re.IGNORECASE
+)
+# Any negation ("do NOT make an image") leaves the decision to OpenAI
+NEGATION_PATTERN = re.compile(r"\b(not|no|never|without)\b|n't\b", re.IGNORECASE)
+
+def is_image_request(text):
+    """True when the tweet unambiguously asks for a generated image"""
+    return bool(IMAGE_REQUEST_PATTERN.search(text)) and not NEGATION_PATTERN.search(text)
+
+# Built once and reused so SQLAlchemy's compiled statement cache is always hit
+METRICS_QUERY = select(BotMetrics).where(BotMetrics.id == METRICS_ROW_ID)
+
+IMAGE_SPOOL_SIZE = 8 << 20  # Generated images larger than 8 MB spill to disk
+
+CONTEXT_LIMIT = 20  # Most recent interactions considered for prompt context
+CONTEXT_LINE_CHARS = 280  # Each interaction is cut to this length
+CONTEXT_MAX_CHARS = 2000  # Total rendered context, roughly 500 tokens
+# The context window only moves at these wall-clock boundaries, so the text is
+# byte-identical across calls and processes in between and stays in OpenAI's
+# prefix cache
+CONTEXT_EPOCH = 900  # seconds
+# Only the columns the prompt uses, returned as plain rows instead of ORM objects
+CONTEXT_COLUMNS = (
+    Interaction.interaction_type,
+    Interaction.content,
+    Interaction.response_content
+)
+
+STATS_CACHE_TTL = 2  # seconds; bounds dashboard polling to one query per window
+
+MAX_PENDING_MENTIONS = 500  # Mentions beyond this queue depth are dropped
+MENTION_JOB_TIMEOUT = 120  # seconds before a stuck mention job is killed
+
 class RateLimitTracker:
     """Centralized rate limit tracking for Twitter API endpoints"""
     def __init__(self):
         self._limits = {}
         self._reset_times = {}
-        self._lock = threading.Lock()
+        # One lock per endpoint so checks on unrelated endpoints never contend
+        self._locks = {}
+        self._locks_guard = threading.Lock()
         self._base_delay = 2100  # 35 minutes base delay
         self._minimum_wait_time = 300  # 5 minutes minimum wait
         self._max_retries = 3
         self._attempt_counts = {}
         self._last_request_times = {}
         logger.info("RateLimitTracker initialized with 35 minute base delay and 5 minute minimum wait")
+
+    def _endpoint_lock(self, endpoint):
+        """Get the lock guarding a single endpoint's tracking data"""
+        lock = self._locks.get(endpoint)
+        if lock is None:
+            with self._locks_guard:
+                lock = self._locks.setdefault(endpoint, threading.Lock())
+        return lock
         
     def update_limits(self, endpoint, headers):
         """Update rate limit information from response headers"""
-        with self._lock:
+        with self._endpoint_lock(endpoint):
             if 'x-rate-limit-remaining' in headers:
                 remaining = int(headers['x-rate-limit-remaining'])
                 self._limits[endpoint] = remaining
@@ -41,7 +120,7 @@ class RateLimitTracker:
                 
     def check_rate_limit(self, endpoint):
         """Check if we can make a request to the endpoint with conservative rate limiting"""
-        with self._lock:
+        with self._endpoint_lock(endpoint):
             # Initialize tracking data if not exists
             if endpoint not in self._attempt_counts:
                 self._attempt_counts[endpoint] = 0
@@ -97,7 +176,7 @@ class RateLimitTracker:
             
     def get_wait_time(self, endpoint):
         """Get the time to wait before next request with exponential backoff"""
-        with self._lock:
+        with self._endpoint_lock(endpoint):
             current_time = int(time.time())
             reset_time = self._reset_times.get(endpoint, current_time + self._base_delay)
             base_wait = max(0, reset_time - current_time)
@@ -150,7 +229,11 @@ class TwitterBot:
             # Initialize other clients
             self.openai_client = OpenAIClient()
             self.replicate_client = ReplicateClient()
-            self.queue = init_queue()
+            self.queue = init_queue(MENTION_QUEUE)
+            self.post_queue = init_queue(POST_QUEUE)
+            self._stats_cache = None  # (expires_at, stats) from the last metrics query
+            # Rendered interaction history, rebuilt only after a new interaction is stored
+            self._context_cache = {"epoch": None, "rendered": None}
             
             logger.info("TwitterBot initialized successfully")
         except Exception as e:
@@ -183,7 +266,9 @@ class TwitterBot:
                 if not self.twitter_api.verify_credentials():
                     raise TwitterAPIError("Failed to verify Twitter API v1.1 access")
                 
-                logger.info(f"Successfully authenticated as @{me.data.username}")
+                # Our own handle never changes, so keep it for create_post
+                self.username = me.data.username
+                logger.info(f"Successfully authenticated as @{self.username}")
                 return True
                 
             except tweepy.errors.TooManyRequests as e:
@@ -203,183 +288,245 @@ class TwitterBot:
                 else:
                     raise TwitterAPIError(f"Failed to verify credentials: {str(e)}")
 
-    def create_post(self):
-        """Generate and post new content with comprehensive retry mechanism"""
+    def create_post(self, attempt=0):
+        """Generate and post new content, rescheduling retries on the post queue"""
         max_retries = 3
         base_delay = 900  # 15 minutes base delay
         buffer_time = 300  # Additional 5 minute buffer between retries
         
-        for attempt in range(max_retries):
-            try:
-                # Check rate limits before posting
-                if not rate_limit_tracker.check_rate_limit('/2/tweets'):
-                    wait_time = rate_limit_tracker.get_wait_time('/2/tweets')
-                    logger.info(f"Rate limit active, waiting {wait_time} seconds...")
-                    time.sleep(wait_time)
-                
-                prompt = self._generate_post_prompt()
-                content = self.openai_client.generate_text(prompt)
-                
-                # Try creating tweet using v2 endpoint
-                response = self.twitter_client.create_tweet(text=content)
-                
-                # Update rate limits from response headers
-                if hasattr(response, 'response') and hasattr(response.response, 'headers'):
-                    rate_limit_tracker.update_limits('/2/tweets', response.response.headers)
-                
-                if not response or 'data' not in response:
-                    raise TwitterAPIError("Invalid response from Twitter API")
-                
-                tweet_id = response['data']['id']
-                me = self.twitter_client.get_me()
-                username = me['data']['username']
-                
-                interaction = Interaction(
-                    interaction_type="post",
-                    tweet_id=tweet_id,
-                    user_handle=username,
-                    content=content
-                )
-                db.session.add(interaction)
-                db.session.commit()
-                logger.info(f"Successfully created tweet: {tweet_id}")
+        try:
+            # Check rate limits before posting
+            if not rate_limit_tracker.check_rate_limit('/2/tweets'):
+                wait_time = rate_limit_tracker.get_wait_time('/2/tweets')
+                logger.info(f"Rate limit active, rescheduling post in {wait_time} seconds...")
+                self._schedule_post(wait_time, attempt)
                 return
+            
+            prompt = self._generate_post_prompt()
+            # New posts must not repeat, so bypass the completion cache
+            content = self.openai_client.generate_text(prompt, use_cache=False)
+            
+            # Try creating tweet using v2 endpoint
+            response = self.twitter_client.create_tweet(text=content)
+            
+            # Update rate limits from response headers
+            if hasattr(response, 'response') and hasattr(response.response, 'headers'):
+                rate_limit_tracker.update_limits('/2/tweets', response.response.headers)
+            
+            if not response or 'data' not in response:
+                raise TwitterAPIError("Invalid response from Twitter API")
+            
+            tweet_id = response['data']['id']
+            
+            interaction = Interaction(
+                interaction_type="post",
+                tweet_id=tweet_id,
+                user_handle=self.username,
+                content=content
+            )
+            db.session.add(interaction)
+            db.session.commit()
+            logger.info(f"Successfully created tweet: {tweet_id}")
+            
+        except tweepy.errors.TooManyRequests as e:
+            # x-rate-limit-reset is an epoch timestamp, not a duration
+            reset_time = e.response.headers.get('x-rate-limit-reset')
+            wait_time = max(int(reset_time) - int(time.time()), 0) if reset_time else base_delay
+            if attempt < max_retries - 1:
+                logger.warning(f"Rate limit hit, retrying in {wait_time} seconds...")
+                self._schedule_post(wait_time, attempt + 1)
+            else:
+                raise TwitterAPIError("Rate limit exceeded after maximum retries")
                 
-            except tweepy.errors.TooManyRequests as e:
-                wait_time = int(e.response.headers.get('x-rate-limit-reset', base_delay))
-                if attempt < max_retries - 1:
-                    logger.warning(f"Rate limit hit, waiting {wait_time} seconds...")
-                    time.sleep(wait_time)
-                else:
-                    raise TwitterAPIError("Rate limit exceeded after maximum retries")
-                    
-            except tweepy.errors.Forbidden as e:
-                logger.error(f"Permission error creating tweet: {str(e)}")
-                if "453" in str(e):  # Access to endpoint restricted
-                    raise TwitterAPIError(
-                        "Access to this endpoint is restricted. "
-                        "Currently have access to a subset of Twitter API V2 endpoints "
-                        "and limited v1.1 endpoints only."
-                    )
-                raise TwitterAPIError(f"Insufficient permissions to create tweet: {str(e)}")
+        except tweepy.errors.Forbidden as e:
+            logger.error(f"Permission error creating tweet: {str(e)}")
+            if "453" in str(e):  # Access to endpoint restricted
+                raise TwitterAPIError(
+                    "Access to this endpoint is restricted. "
+                    "Currently have access to a subset of Twitter API V2 endpoints "
+                    "and limited v1.1 endpoints only."
+                )
+            raise TwitterAPIError(f"Insufficient permissions to create tweet: {str(e)}")
+            
+        except tweepy.errors.TweepyException as e:
+            retry_delay = base_delay * (2 ** attempt) + buffer_time  # Exponential backoff starting at 15 minutes + buffer
+            logger.error(f"Twitter API error (attempt {attempt + 1}/{max_retries}): {str(e)}")
+            if attempt < max_retries - 1:
+                logger.info(f"Retrying in {retry_delay} seconds...")
+                self._schedule_post(retry_delay, attempt + 1)
+            else:
+                raise TwitterAPIError(f"Failed to create tweet after {max_retries} attempts: {str(e)}")
                 
-            except tweepy.errors.TweepyException as e:
-                retry_delay = base_delay * (2 ** attempt) + buffer_time  # Exponential backoff starting at 15 minutes + buffer
-                logger.error(f"Twitter API error (attempt {attempt + 1}/{max_retries}): {str(e)}")
-                if attempt < max_retries - 1:
-                    logger.info(f"Retrying in {retry_delay} seconds...")
-                    time.sleep(retry_delay)
-                else:
-                    raise TwitterAPIError(f"Failed to create tweet after {max_retries} attempts: {str(e)}")
-                    
-            except Exception as e:
-                logger.error(f"Unexpected error creating tweet: {str(e)}")
-                raise
+        except Exception as e:
+            logger.error(f"Unexpected error creating tweet: {str(e)}")
+            db.session.rollback()
+            raise
+
+    def _schedule_post(self, delay, attempt):
+        """Re-enqueue create_post after a delay instead of holding the worker asleep"""
+        self.post_queue.enqueue_in(
+            timedelta(seconds=delay), tasks.create_post, attempt,
+            **JOB_OPTIONS
+        )
 
     def _generate_post_prompt(self):
         """Generate prompt for creating new posts"""
-        return """Generate an engaging tweet about technology, AI, art, or creativity. 
-        The tweet should be informative, witty, and encourage interaction. 
-        Keep it under 280 characters and make it conversational. 
-        Include relevant hashtags where appropriate."""
+        return POST_PROMPT
 
     def handle_reply(self, tweet_id, user_handle, content):
         """Process and respond to replies with error handling"""
+        if already_seen(tweet_id, "reply"):
+            logger.info(f"Reply to tweet {tweet_id} already handled, skipping")
+            return
+
+        posted = False
         try:
             context = self._get_context()
             should_respond = self._should_respond(content, context)
             
             if should_respond:
-                response_type = self._determine_response_type(content)
+                response_type, response = self._generate_response(
+                    content, SYSTEM_PROMPT_REPLY, self._generate_reply_prompt(content, context), context
+                )
                 
                 if response_type == "image":
-                    prompt = f"CMONKE {content}"
-                    image_url = self.replicate_client.generate_image(prompt)
-                    # Download the image and upload using v1.1 API
-                    import requests
-                    image_data = requests.get(image_url).content
-                    media = self.twitter_api.media_upload(filename="response.png", file=image_data)
-                    status = self.twitter_api.update_status(
-                        status="Here's what I visualized:",
-                        in_reply_to_status_id=tweet_id,
-                        media_ids=[media.media_id]
-                    )
-                    response_id = status.id
+                    status = self._post_image_reply(tweet_id, response, "Here's what I visualized:")
                     response_text = status.text
                 else:
-                    response_text = self.openai_client.generate_text(
-                        self._generate_reply_prompt(content, context)
-                    )
-                    status = self.twitter_api.update_status(
+                    response_text = response
+                    self.twitter_api.update_status(
                         status=response_text,
                         in_reply_to_status_id=tweet_id
                     )
-                    response_id = status.id
+                posted = True
                 
                 self._store_interaction("reply", tweet_id, user_handle, content, 
                                      response_type, response_text)
                 logger.info(f"Successfully replied to tweet {tweet_id}")
         except Exception as e:
             logger.error(f"Error handling reply to tweet {tweet_id}: {str(e)}")
+            # Let a retry through unless the reply is already live, where a
+            # retry would post it twice
+            if not posted:
+                forget_seen(tweet_id, kind="reply")
             raise
 
     def handle_mention(self, tweet_id, user_handle, content):
         """Process and respond to mentions"""
         try:
-            self.queue.enqueue(self._process_mention, tweet_id, user_handle, content)
+            # Shed load during mention storms instead of growing the queue without bound
+            pending = len(self.queue)
+            if pending >= MAX_PENDING_MENTIONS:
+                logger.warning(f"Mention queue full ({pending} pending), dropping mention {tweet_id}")
+                return False
+
+            if already_seen(tweet_id, "mention"):
+                logger.info(f"Mention {tweet_id} already queued, skipping")
+                return False
+            
+            try:
+                self.queue.enqueue(
+                    tasks.process_mention, tweet_id, user_handle, content,
+                    job_timeout=MENTION_JOB_TIMEOUT,
+                    **JOB_OPTIONS
+                )
+            except Exception:
+                forget_seen(tweet_id, kind="mention")
+                raise
             logger.info(f"Queued mention processing for tweet {tweet_id}")
+            return True
         except Exception as e:
             logger.error(f"Error queueing mention processing: {str(e)}")
             raise
 
-    def _process_mention(self, tweet_id, user_handle, content):
+    def handle_mentions(self, mentions):
+        """Queue a batch of (tweet_id, user_handle, content) mentions in one round trip"""
+        try:
+            # Drop duplicates first so they do not take up queue slots
+            mentions = [mention for mention in mentions if not already_seen(mention[0], "mention")]
+            room = max(MAX_PENDING_MENTIONS - len(self.queue), 0)
+            if len(mentions) > room:
+                logger.warning(f"Mention queue nearly full, dropping {len(mentions) - room} of {len(mentions)} mentions")
+                # Dropped mentions were never queued, so they must not count as seen
+                forget_seen(*(mention[0] for mention in mentions[room:]), kind="mention")
+                mentions = mentions[:room]
+            if not mentions:
+                return 0
+
+            # enqueue_many writes every job through a single pipeline
+            try:
+                self.queue.enqueue_many([
+                    Queue.prepare_data(
+                        tasks.process_mention, (tweet_id, user_handle, content),
+                        timeout=MENTION_JOB_TIMEOUT,
+                        **JOB_OPTIONS
+                    )
+                    for tweet_id, user_handle, content in mentions
+                ])
+            except Exception:
+                forget_seen(*(mention[0] for mention in mentions), kind="mention")
+                raise
+            logger.info(f"Queued {len(mentions)} mentions for processing")
+            return len(mentions)
+        except Exception as e:
+            logger.error(f"Error queueing mention batch: {str(e)}")
+            raise
+
+    def process_mention(self, tweet_id, user_handle, content):
         """Process mention with error handling"""
+        posted = False
         try:
             context = self._get_context()
-            response_type = self._determine_response_type(content)
+            response_type, response = self._generate_response(
+                content, SYSTEM_PROMPT_MENTION, self._generate_mention_prompt(content, context), context
+            )
             
             if response_type == "image":
-                prompt = f"CMONKE {content}"
-                image_url = self.replicate_client.generate_image(prompt)
-                # Download the image and upload using v1.1 API
-                import requests
-                image_data = requests.get(image_url).content
-                media = self.twitter_api.media_upload(filename="response.png", file=image_data)
-                status = self.twitter_api.update_status(
-                    status="Here's what I created:",
-                    in_reply_to_status_id=tweet_id,
-                    media_ids=[media.media_id]
-                )
+                status = self._post_image_reply(tweet_id, response, "Here's what I created:")
                 response_text = status.text
             else:
-                response_text = self.openai_client.generate_text(
-                    self._generate_mention_prompt(content, context)
-                )
-                status = self.twitter_api.update_status(
+                response_text = response
+                self.twitter_api.update_status(
                     status=response_text,
                     in_reply_to_status_id=tweet_id
                 )
+            posted = True
             
             self._store_interaction("mention", tweet_id, user_handle, content,
                                  response_type, response_text)
             logger.info(f"Successfully processed mention for tweet {tweet_id}")
         except Exception as e:
             logger.error(f"Error processing mention for tweet {tweet_id}: {str(e)}")
+            # Same rule as handle_reply: only a mention with no reply posted
+            # may be queued again
+            if not posted:
+                forget_seen(tweet_id, kind="mention")
             raise
 
+    def _post_image_reply(self, tweet_id, prompt, caption):
+        """Generate an image for the prompt and post it as a reply to the tweet"""
+        image_url = self.replicate_client.generate_image(f"CMONKE {prompt}")
+        # Stream the image into a spooled buffer and upload using v1.1 API
+        with http_client.stream("GET", image_url) as image_response, \
+                tempfile.SpooledTemporaryFile(max_size=IMAGE_SPOOL_SIZE) as image_file:
+            image_response.raise_for_status()
+            for chunk in image_response.iter_bytes():
+                image_file.write(chunk)
+            image_file.seek(0)
+            media = self.twitter_api.media_upload(filename="response.png", file=image_file)
+        return self.twitter_api.update_status(
+            status=caption,
+            in_reply_to_status_id=tweet_id,
+            media_ids=[media.media_id]
+        )
+
     def _generate_reply_prompt(self, content, context):
-        """Generate prompt for replies based on context"""
-        return f"""Given this tweet: "{content}"
-        And considering the context of our previous interactions,
-        generate a friendly and engaging reply that maintains continuity
-        of the conversation. Keep it under 280 characters."""
+        """Generate the per-tweet part of a reply prompt"""
+        return REPLY_PROMPT_TEMPLATE.format(content=content)
 
     def _generate_mention_prompt(self, content, context):
-        """Generate prompt for mention responses"""
-        return f"""Someone mentioned me in this tweet: "{content}"
-        Generate an appropriate response that's helpful and engaging.
-        Consider the context of any previous interactions.
-        Keep it under 280 characters."""
+        """Generate the per-tweet part of a mention prompt"""
+        return MENTION_PROMPT_TEMPLATE.format(content=content)
 
     def _should_respond(self, content, context):
         """Determine if we should respond to this interaction"""
@@ -387,24 +534,64 @@ class TwitterBot:
         return True
 
     def _get_context(self):
-        """Retrieve last 100 interactions for context"""
+        """Render recent interactions as prompt context, rebuilt once per epoch
+
+        Only interactions stored before the current epoch started are used, so
+        every process renders the same text until the next boundary.
+        """
+        cache = self._context_cache
+        epoch = int(time.time() // CONTEXT_EPOCH)
+        if cache["rendered"] is not None and cache["epoch"] == epoch:
+            return cache["rendered"]
         try:
-            return Interaction.query.order_by(
-                Interaction.created_at.desc()
-            ).limit(100).all()
+            epoch_start = datetime.fromtimestamp(epoch * CONTEXT_EPOCH, tz=timezone.utc)
+            interactions = Interaction.recent_tuples(
+                CONTEXT_LIMIT, columns=CONTEXT_COLUMNS, before=epoch_start
+            )
+            rendered = self._render_context(interactions)
+            cache.update(epoch=epoch, rendered=rendered)
+            return rendered
         except Exception as e:
             logger.error(f"Error retrieving context: {str(e)}")
-            return []
+            return ""
+
+    def _render_context(self, interactions):
+        """Format the newest interactions that fit CONTEXT_MAX_CHARS, oldest first"""
+        lines = []
+        size = 0
+        for interaction in interactions:  # newest first
+            line = f"[{interaction.interaction_type}] {interaction.content}"
+            if interaction.response_content:
+                line += f" -> {interaction.response_content}"
+            line = line[:CONTEXT_LINE_CHARS]
+            if size + len(line) > CONTEXT_MAX_CHARS:
+                break
+            lines.append(line)
+            size += len(line) + 1
+        if not lines:
+            return ""
+        return "Previous interactions, oldest first:\n" + "\n".join(reversed(lines))
 
-    def _determine_response_type(self, content):
-        """Decide whether to respond with text or image"""
+    def _generate_response(self, content, system_prompt, prompt, context):
+        """Decide between text and image and draft the response in one OpenAI call"""
+        if is_image_request(content):
+            return 'image', content
+        
         try:
-            prompt = f"Analyze this content and decide if it requires an image response or text response. Content: {content}"
-            response = self.openai_client.analyze_content(prompt)
-            return response['type']  # 'text' or 'image'
+            result = self.openai_client.classify_and_generate(
+                prompt, system_prompt=system_prompt, context=context
+            )
+            if result.get('type') == 'image':
+                return 'image', result.get('image_prompt') or content
+            if result.get('text'):
+                return 'text', result['text']
+            logger.warning("Combined response had no usable text, falling back to plain generation")
         except Exception as e:
-            logger.error(f"Error determining response type: {str(e)}")
-            return 'text'  # Default to text response on error
+            logger.error(f"Error generating combined response: {str(e)}")
+        # Default to a text response when the combined call is unusable
+        return 'text', self.openai_client.generate_text(
+            prompt, system_prompt=system_prompt, context=context
+        )
 
     def _store_interaction(self, type, tweet_id, user_handle, content, 
                          response_type, response_content):
@@ -419,26 +606,31 @@ class TwitterBot:
                 response_content=response_content
             )
             db.session.add(interaction)
-            
-            metrics = BotMetrics.query.order_by(BotMetrics.id.desc()).first()
-            if not metrics:
-                metrics = BotMetrics()
-                db.session.add(metrics)
+            try:
+                db.session.commit()
+            except IntegrityError:
+                # tweet_id + interaction_type is unique, so this was already recorded
+                db.session.rollback()
+                logger.warning(f"Interaction of type {type} for tweet {tweet_id} already stored")
+                return
             
             if type == "post":
-                metrics.post_count += 1
+                count_column = "post_count"
             elif type == "reply":
-                metrics.reply_count += 1
+                count_column = "reply_count"
             else:
-                metrics.mention_count += 1
-                
+                count_column = "mention_count"
+            
             if response_type == "image":
-                metrics.image_response_count += 1
+                response_column = "image_response_count"
             else:
-                metrics.text_response_count += 1
-                
-            metrics.updated_at = datetime.utcnow()
-            db.session.commit()
+                response_column = "text_response_count"
+            
+            try:
+                increment_metrics(count_column, response_column)
+            except Exception as e:
+                # The interaction itself is stored; losing one counter bump is not worth failing for
+                logger.error(f"Error recording metrics: {str(e)}")
             logger.info(f"Successfully stored interaction of type {type}")
         except Exception as e:
             logger.error(f"Error storing interaction: {str(e)}")
@@ -447,29 +639,51 @@ class TwitterBot:
 
     def get_stats(self):
         """Get bot statistics for dashboard"""
+        cached = self._stats_cache
+        if cached is not None and cached[0] > time.monotonic():
+            stats = dict(cached[1])
+        else:
+            stats = self._query_stats()
+        try:
+            stats.update(self.openai_client.cache.stats.to_dict())
+        except Exception as e:
+            logger.error(f"Error retrieving cache stats: {str(e)}")
+        try:
+            stats["queue_depth"] = len(self.queue)
+        except Exception as e:
+            logger.error(f"Error retrieving queue depth: {str(e)}")
+            stats["queue_depth"] = None
+        return stats
+
+    def _query_stats(self):
+        """Load metric totals and cache them briefly
+
+        The flushed counts in Postgres and the pending increments in Redis are
+        read and cached together. Caching only the database part would drop
+        freshly flushed counts from both until the cache expired.
+        """
+        stats = {
+            "post_count": 0,
+            "reply_count": 0,
+            "mention_count": 0,
+            "image_response_count": 0,
+            "text_response_count": 0
+        }
         try:
-            metrics = BotMetrics.query.order_by(BotMetrics.id.desc()).first()
-            if not metrics:
-                return {
-                    "post_count": 0,
-                    "reply_count": 0,
-                    "mention_count": 0,
-                    "image_response_count": 0,
-                    "text_response_count": 0
-                }
-            return {
-                "post_count": metrics.post_count,
-                "reply_count": metrics.reply_count,
-                "mention_count": metrics.mention_count,
-                "image_response_count": metrics.image_response_count,
-                "text_response_count": metrics.text_response_count
-            }
+            metrics = db.session.execute(METRICS_QUERY).scalar_one_or_none()
+            if metrics:
+                stats.update({
+                    "post_count": metrics.post_count,
+                    "reply_count": metrics.reply_count,
+                    "mention_count": metrics.mention_count,
+                    "image_response_count": metrics.image_response_count,
+                    "text_response_count": metrics.text_response_count
+                })
+            # Include increments still waiting in Redis for the next flush;
+            # a partial total is returned but never cached
+            for column, n in pending_counts().items():
+                stats[column] += n
+            self._stats_cache = (time.monotonic() + STATS_CACHE_TTL, dict(stats))
         except Exception as e:
             logger.error(f"Error retrieving stats: {str(e)}")
-            return {
-                "post_count": 0,
-                "reply_count": 0,
-                "mention_count": 0,
-                "image_response_count": 0,
-                "text_response_count": 0
-            }
\ No newline at end of file
+        return stats
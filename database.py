@@ -5,3 +5,14 @@ class Base(DeclarativeBase):
     pass
 
 db = SQLAlchemy(model_class=Base)
+
+# Pre-ping on checkout catches connections the server dropped while idle, and
+# recycling after 5 minutes stays ahead of the hosted Postgres idle timeout
+ENGINE_OPTIONS = {
+    "pool_recycle": 300,
+    "pool_pre_ping": True,
+    "pool_size": 10,
+    "max_overflow": 20,
+    "pool_timeout": 5,
+    "connect_args": {"connect_timeout": 10},
+}
@@ -0,0 +1,29 @@
+import logging
+from queue_manager import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+# Long enough to cover Twitter redelivering or re-listing the same tweet
+SEEN_TTL = 86400
+KEY_PREFIX = "seen:"
+
+def already_seen(tweet_id, kind="mention"):
+    """Atomically mark a tweet as seen, returning True if it was already marked
+
+    A single SET NX in Redis replaces a Postgres lookup per incoming tweet;
+    the unique constraint on Interaction still backs this up if a key expires.
+    """
+    return not get_redis_connection().set(f"{KEY_PREFIX}{kind}:{tweet_id}", b"1", nx=True, ex=SEEN_TTL)
+
+def forget(*tweet_ids, kind="mention"):
+    """Clear seen markers so tweets whose handling failed can be retried
+
+    Called from error paths, so a Redis failure here is logged rather than
+    raised over the original error.
+    """
+    if not tweet_ids:
+        return
+    try:
+        get_redis_connection().delete(*(f"{KEY_PREFIX}{kind}:{tweet_id}" for tweet_id in tweet_ids))
+    except Exception as e:
+        logger.error(f"Error clearing seen markers for {kind} tweets {tweet_ids}: {str(e)}")
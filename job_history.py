@@ -0,0 +1,42 @@
+import logging
+from datetime import timezone
+from rq import Callback
+from models import JobHistory, bulk_insert
+
+logger = logging.getLogger(__name__)
+
+def _record(job, status, error=None):
+    """Archive a finished job; never let bookkeeping fail the job itself"""
+    enqueued_at = job.enqueued_at
+    if enqueued_at is not None and enqueued_at.tzinfo is None:
+        enqueued_at = enqueued_at.replace(tzinfo=timezone.utc)  # RQ stores naive UTC
+    try:
+        bulk_insert(JobHistory, [{
+            "job_id": job.id,
+            "queue": job.origin,
+            "func_name": job.func_name,
+            "status": status,
+            "error": error,
+            "enqueued_at": enqueued_at,
+        }])
+    except Exception as e:
+        logger.error(f"Error archiving job {job.id}: {str(e)}")
+
+def record_success(job, connection, result, *args, **kwargs):
+    _record(job, "finished")
+
+def record_failure(job, connection, exc_type, exc_value, traceback):
+    _record(job, "failed", f"{exc_type.__name__}: {exc_value}")
+
+ON_SUCCESS = Callback(record_success)
+ON_FAILURE = Callback(record_failure)
+
+# Options for every enqueue. RQ's Queue constructor ignores result_ttl and
+# failure_ttl, so they only take effect per job. Redis keeps a short window;
+# the callbacks archive each job to Postgres.
+JOB_OPTIONS = {
+    "result_ttl": 600,  # Keep results for 10 minutes
+    "failure_ttl": 3600,  # Keep failed jobs for 1 hour
+    "on_success": ON_SUCCESS,
+    "on_failure": ON_FAILURE,
+}
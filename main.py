@@ -1,11 +1,12 @@
-from app import app, bot, queue
+from app import app, bot
+from database import db
+from job_history import JOB_OPTIONS
+import tasks
 import time
-import threading
 import logging
 import subprocess
 import os
 import signal
-from bot import TwitterAPIError
 
 # Configure logging
 logging.basicConfig(
@@ -21,20 +22,16 @@ def run_bot():
     
     while True:
         try:
-            # Create new post every 4 hours
-            bot.create_post()
+            # Queue a new post every 4 hours; workers only reach the low
+            # priority queue once pending mentions have been handled
+            bot.post_queue.enqueue(tasks.create_post, **JOB_OPTIONS)
             consecutive_errors = 0  # Reset error counter on success
-            logger.info("Successfully created new post")
+            logger.info("Queued new post")
             time.sleep(14400)  # 4 hours
-        except TwitterAPIError as e:
-            logger.error(f"Twitter API Error: {str(e)}")
-            # For API permission errors, we should stop the bot
-            logger.critical("Stopping bot due to API permission error")
-            break
         except Exception as e:
             consecutive_errors += 1
             delay = min(base_delay * (2 ** consecutive_errors), 3600)  # Max 1 hour delay
-            logger.error(f"Error in bot thread (attempt {consecutive_errors}): {str(e)}")
+            logger.error(f"Error queueing post (attempt {consecutive_errors}): {str(e)}")
             
             if consecutive_errors >= max_consecutive_errors:
                 logger.critical(f"Bot stopped after {consecutive_errors} consecutive errors")
@@ -66,53 +63,21 @@ if __name__ == "__main__":
             raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
         logger.info("✓ Environment variables verified successfully")
 
-        # Step 2: Verify database connection with timeout
+        # Step 2: Verify database connection; connect_timeout makes libpq give up after 10 seconds
         logger.info("Verifying database connection...")
-        from sqlalchemy import create_engine
-        from sqlalchemy.exc import SQLAlchemyError
-        import threading
-        import queue as Queue
-
-        def test_db_connection():
-            try:
-                with app.app_context():
-                    db.engine.connect()
-                    import models
-                    db.create_all()
-                return True
-            except Exception as e:
-                return e
-
-        # Use a queue to handle the timeout
-        q = Queue.Queue()
-        db_thread = threading.Thread(target=lambda: q.put(test_db_connection()))
-        db_thread.daemon = True
-        db_thread.start()
-        db_thread.join(timeout=10)  # 10 second timeout
-
-        if db_thread.is_alive():
-            raise TimeoutError("Database connection timed out after 10 seconds")
-
-        result = q.get()
-        if isinstance(result, Exception):
-            raise result
+        with app.app_context():
+            db.engine.connect().close()
+            import models
+            db.create_all()
         logger.info("✓ Database connection and tables verified")
 
         # Step 3: Start Flask app in debug mode
         logger.info("Starting Flask application in debug mode...")
-        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
-            'pool_pre_ping': True,
-            'pool_recycle': 300,
-            'connect_args': {'connect_timeout': 10}
-        }
         app.run(host="0.0.0.0", port=5000, debug=True)
 
     except ValueError as ve:
         logger.critical(f"Configuration error: {str(ve)}")
         raise
-    except TimeoutError as te:
-        logger.critical(f"Timeout error: {str(te)}")
-        raise
     except Exception as e:
         logger.critical(f"Failed to start application: {str(e)}", exc_info=True)
         raise
@@ -0,0 +1,81 @@
+import time
+import logging
+import threading
+from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import insert
+from database import db
+from models import BotMetrics
+from queue_manager import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+# All counters live in a single BotMetrics row that is upserted in place
+METRICS_ROW_ID = 1
+METRIC_COLUMNS = (
+    "post_count",
+    "reply_count",
+    "mention_count",
+    "image_response_count",
+    "text_response_count"
+)
+KEY_PREFIX = "botmetrics:"
+FLUSH_INTERVAL = 60  # seconds between flushes from Redis to Postgres
+
+def _keys():
+    return [KEY_PREFIX + column for column in METRIC_COLUMNS]
+
+def increment(*columns):
+    """Atomically bump counters in Redis; shared by every web and worker process"""
+    pipe = get_redis_connection().pipeline(transaction=False)
+    for column in columns:
+        pipe.incr(KEY_PREFIX + column)
+    pipe.execute()
+
+def pending_counts():
+    """Increments recorded in Redis that have not been flushed yet"""
+    values = get_redis_connection().mget(_keys())
+    return {column: int(value) for column, value in zip(METRIC_COLUMNS, values) if value}
+
+def flush():
+    """Move counters from Redis into the BotMetrics row with a single upsert"""
+    redis_conn = get_redis_connection()
+    # Read and clear inside MULTI/EXEC so increments landing mid-flush are kept
+    pipe = redis_conn.pipeline(transaction=True)
+    pipe.mget(_keys())
+    pipe.delete(*_keys())
+    values, _ = pipe.execute()
+    counts = {column: int(value) for column, value in zip(METRIC_COLUMNS, values) if value}
+    if not counts:
+        return
+
+    try:
+        stmt = insert(BotMetrics).values(
+            id=METRICS_ROW_ID,
+            **counts
+        )
+        set_ = {column: getattr(BotMetrics, column) + stmt.excluded[column] for column in counts}
+        set_["updated_at"] = func.now()
+        db.session.execute(stmt.on_conflict_do_update(index_elements=[BotMetrics.id], set_=set_))
+        db.session.commit()
+    except Exception as e:
+        logger.error(f"Error flushing metrics: {str(e)}")
+        db.session.rollback()
+        # Put the counts back so the next flush retries them
+        pipe = redis_conn.pipeline(transaction=False)
+        for column, n in counts.items():
+            pipe.incrby(KEY_PREFIX + column, n)
+        pipe.execute()
+
+def start_flusher(app):
+    """Flush counters from a daemon thread; safe to run in several processes at once"""
+    def flush_loop():
+        while True:
+            time.sleep(FLUSH_INTERVAL)
+            try:
+                with app.app_context():
+                    flush()
+            except Exception as e:
+                logger.error(f"Metrics flusher error: {str(e)}")
+
+    thread = threading.Thread(target=flush_loop, name="metrics-flusher", daemon=True)
+    thread.start()
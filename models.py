@@ -1,21 +1,86 @@
-from datetime import datetime
+import zlib
+import base64
+from sqlalchemy import select
+from sqlalchemy.sql import func
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.dialects.postgresql import JSONB
 from database import db
 
+class CompressedText(TypeDecorator):
+    """Text column that transparently zlib-compresses long values
+
+    Short values such as ordinary tweets are stored as-is; only values past
+    COMPRESS_THRESHOLD are compressed, base64-encoded and tagged with PREFIX
+    so both forms can be read back from the same column.
+    """
+    impl = db.Text
+    cache_ok = True
+
+    PREFIX = 'zlib:'
+    COMPRESS_THRESHOLD = 1024
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return value
+        # Values that happen to start with PREFIX are always compressed so
+        # they cannot be mistaken for compressed data on the way back
+        ambiguous = value.startswith(self.PREFIX)
+        if len(value) < self.COMPRESS_THRESHOLD and not ambiguous:
+            return value
+        compressed = self.PREFIX + base64.b64encode(zlib.compress(value.encode('utf-8'), 6)).decode('ascii')
+        if len(compressed) >= len(value) and not ambiguous:
+            return value
+        return compressed
+
+    def process_result_value(self, value, dialect):
+        if value is None or not value.startswith(self.PREFIX):
+            return value
+        return zlib.decompress(base64.b64decode(value[len(self.PREFIX):])).decode('utf-8')
+
 class Interaction(db.Model):
+    __table_args__ = (
+        # Lets the database reject duplicate handling of a tweet; also serves tweet_id lookups
+        db.UniqueConstraint('tweet_id', 'interaction_type', name='uq_interaction_tweet_type'),
+        # Latest interactions of a given type
+        db.Index('ix_interaction_type_created', 'interaction_type', 'created_at'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     interaction_type = db.Column(db.String(20), nullable=False)  # post, reply, mention
     tweet_id = db.Column(db.String(50), nullable=False)
-    user_handle = db.Column(db.String(50), nullable=False)
-    content = db.Column(db.Text, nullable=False)
+    user_handle = db.Column(db.String(50), nullable=False, index=True)
+    content = db.Column(CompressedText, nullable=False)
     response_type = db.Column(db.String(20))  # text, image
-    response_content = db.Column(db.Text)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    response_content = db.Column(CompressedText)
+    created_at = db.Column(db.DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+
+    @classmethod
+    def recent_tuples(cls, limit=100, columns=None, before=None):
+        """Return the newest interactions as plain Row tuples, newest first
+
+        Selecting columns skips ORM object construction and the identity map,
+        which dominates the cost of read-only scans. Defaults to tweet_id,
+        user_handle and created_at when no columns are given. With before,
+        only interactions created earlier than that time are returned.
+        """
+        columns = columns or (cls.tweet_id, cls.user_handle, cls.created_at)
+        query = select(*columns).select_from(cls)
+        if before is not None:
+            query = query.where(cls.created_at < before)
+        return db.session.execute(
+            query.order_by(cls.created_at.desc()).limit(limit)
+        ).all()
 
 class Context(db.Model):
+    __table_args__ = (
+        # Containment queries (context_data @> ...) on the binary JSONB layout
+        db.Index('ix_context_data_gin', 'context_data', postgresql_using='gin'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     interaction_id = db.Column(db.Integer, db.ForeignKey('interaction.id'))
-    context_data = db.Column(db.JSON, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    context_data = db.Column(JSONB, nullable=False)
+    created_at = db.Column(db.DateTime(timezone=True), server_default=func.now(), nullable=False)
 
 class BotMetrics(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -24,4 +89,28 @@ class BotMetrics(db.Model):
     mention_count = db.Column(db.Integer, default=0)
     image_response_count = db.Column(db.Integer, default=0)
     text_response_count = db.Column(db.Integer, default=0)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+class JobHistory(db.Model):
+    # Finished RQ jobs, archived here so Redis only keeps a short window
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.String(64), nullable=False, index=True)
+    queue = db.Column(db.String(50), nullable=False)
+    func_name = db.Column(db.String(200))
+    status = db.Column(db.String(20), nullable=False)  # finished, failed
+    error = db.Column(db.Text)
+    enqueued_at = db.Column(db.DateTime(timezone=True))
+    created_at = db.Column(db.DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+
+def bulk_insert(model, rows):
+    """Insert many rows given as dicts with a single executemany and one commit"""
+    rows = list(rows)
+    if not rows:
+        return 0
+    try:
+        db.session.bulk_insert_mappings(model, rows)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return len(rows)
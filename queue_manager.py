@@ -1,87 +1,224 @@
 import os
 import time
+import asyncio
 import socket
 import logging
+import threading
 from rq import Queue
 import redis
 from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
 from redis.backoff import ExponentialBackoff
 from redis.retry import Retry
+from redis.utils import HIREDIS_AVAILABLE
 
 logger = logging.getLogger(__name__)
 
-def init_queue():
-    """Initialize Redis queue with proper error handling"""
+# Workers drain queues in the order given, so mentions are listed first
+MENTION_QUEUE = 'mentions'
+POST_QUEUE = 'posts'
+
+# Probe idle sockets after 60 seconds and give up after 3 missed probes 10
+# seconds apart, instead of the kernel's two hour keepalive default
+KEEPALIVE_OPTIONS = {
+    getattr(socket, name): value
+    for name, value in (('TCP_KEEPIDLE', 60), ('TCP_KEEPINTVL', 10), ('TCP_KEEPCNT', 3))
+    if hasattr(socket, name)
+}
+
+# Retry strategy with exponential backoff, shared by every pooled connection
+_RETRY = Retry(ExponentialBackoff(cap=10, base=1), 3)
+
+# Redis settings, read from the environment once at import
+REDIS_HOST = None
+REDIS_PORT = None
+REDIS_PASSWORD = None
+REDIS_POOL_SIZE = 32
+
+def reload_config():
+    """Re-read Redis settings from the environment"""
+    global REDIS_HOST, REDIS_PORT, REDIS_PASSWORD, REDIS_POOL_SIZE
+    REDIS_HOST = os.environ.get('REDIS_HOST')
+    REDIS_PORT = os.environ.get('REDIS_PORT')
+    REDIS_PASSWORD = os.environ.get('REDIS_PASSWORD')
+    REDIS_POOL_SIZE = int(os.environ.get('REDIS_POOL_SIZE', 32))
+
+reload_config()
+
+# Redis is dialled by IP to skip DNS on reconnects; the address is re-resolved
+# this often so a failover to a new IP is picked up without a restart
+RESOLVE_INTERVAL = 60
+_redis_address = None
+
+class _ResolvedConnection(redis.Connection):
+    """Connection that dials the most recently resolved Redis address"""
+
+    def connect(self):
+        if _redis_address:
+            self.host = _redis_address
+        return super().connect()
+
+# One connection and one Queue per name for the whole process, so repeated
+# init_queue calls skip the Redis handshake entirely
+_init_lock = threading.RLock()
+_redis_conn = None
+_queues = {}
+
+def get_redis_connection():
+    """Return the shared Redis connection, connecting on first use"""
+    global _redis_conn
+    if _redis_conn is None:
+        with _init_lock:
+            if _redis_conn is None:
+                _redis_conn = _connect()
+    return _redis_conn
+
+def _connect():
+    """Create the Redis connection and verify it with a ping"""
+    if not all([REDIS_HOST, REDIS_PORT, REDIS_PASSWORD]):
+        missing_vars = []
+        if not REDIS_HOST: missing_vars.append('REDIS_HOST')
+        if not REDIS_PORT: missing_vars.append('REDIS_PORT')
+        if not REDIS_PASSWORD: missing_vars.append('REDIS_PASSWORD')
+        error_msg = f"Missing Redis configuration: {', '.join(missing_vars)}"
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+
+    # Log connection attempt
+    logger.info("Attempting to connect to Redis at %s:%s", REDIS_HOST, REDIS_PORT)
+    logger.debug("Using Redis port from environment: %s", REDIS_PORT)
+
+    # redis-py picks the hiredis C parser automatically when it is installed;
+    # without it RQ job payloads are decoded by the much slower Python parser
+    if HIREDIS_AVAILABLE:
+        logger.info("Using hiredis parser for Redis responses")
+    else:
+        logger.warning("hiredis is not installed; falling back to the pure Python Redis parser")
+
+    # Construct Redis URL with proper formatting; connections dial the resolved
+    # address instead of the name, so retry reconnects skip DNS entirely
+    global _redis_address
+    _redis_address = _resolve_host(REDIS_HOST, REDIS_PORT)
+    redis_url = f"redis://:{REDIS_PASSWORD}@{REDIS_HOST}:{REDIS_PORT}/0"
+
+    # Bounded pool so concurrent enqueues and worker polls each get their own
+    # socket; callers block up to 20 seconds for a free one instead of failing
+    pool = redis.BlockingConnectionPool.from_url(
+        redis_url,
+        max_connections=REDIS_POOL_SIZE,
+        timeout=20,
+        decode_responses=False,  # Required for RQ compatibility
+        socket_timeout=30,       # Updated as requested
+        socket_connect_timeout=20,  # Updated as requested
+        socket_keepalive=True,   # Added as requested
+        socket_keepalive_options=KEEPALIVE_OPTIONS,
+        retry_on_timeout=True,
+        retry=_RETRY,
+        health_check_interval=30,
+        client_name='twitter_bot',  # Set on every pooled connection as it opens
+        connection_class=_ResolvedConnection
+    )
+    redis_conn = redis.Redis(connection_pool=pool)
+    
+    # Test connection with retry logic
+    for attempt in range(3):
+        try:
+            logger.info("Testing Redis connection (attempt %d/3)", attempt + 1)
+            # Health check and eviction policy check share one round trip
+            pipe = redis_conn.pipeline(transaction=False)
+            pipe.ping()
+            pipe.config_get('maxmemory-policy')
+            ping_result, config = pipe.execute(raise_on_error=False)
+            if isinstance(ping_result, Exception):
+                raise ping_result
+            logger.info("Successfully connected to Redis")
+            _check_eviction_policy(config)
+            break
+        except (RedisConnectionError, RedisTimeoutError) as e:
+            if attempt == 2:  # Last attempt
+                logger.error("Failed to connect to Redis after 3 attempts: %s", e)
+                raise
+            delay = min(2 ** attempt, 10)  # Exponential backoff capped at 10 seconds
+            logger.warning("Redis connection attempt %d failed, retrying in %d seconds...", attempt + 1, delay)
+            time.sleep(delay)
+
+    _start_resolver(pool)
+    return redis_conn
+
+def _resolve_host(host, port):
+    """Resolve the Redis hostname, falling back to the name if DNS fails"""
     try:
-        # Get Redis configuration from environment
-        redis_host = os.environ.get('REDIS_HOST')
-        redis_port = os.environ.get('REDIS_PORT')
-        redis_password = os.environ.get('REDIS_PASSWORD')
-
-        if not all([redis_host, redis_port, redis_password]):
-            missing_vars = []
-            if not redis_host: missing_vars.append('REDIS_HOST')
-            if not redis_port: missing_vars.append('REDIS_PORT')
-            if not redis_password: missing_vars.append('REDIS_PASSWORD')
-            error_msg = f"Missing Redis configuration: {', '.join(missing_vars)}"
-            logger.error(error_msg)
-            raise ValueError(error_msg)
-
-        # Log connection attempt
-        logger.info(f"Attempting to connect to Redis at {redis_host}:{redis_port}")
-        logger.debug(f"Using Redis port from environment: {redis_port}")
-
-        # Construct Redis URL with proper formatting
-        redis_url = f"redis://:{redis_password}@{redis_host}:{redis_port}/0"
-
-        # Configure retry strategy with exponential backoff
-        retry = Retry(ExponentialBackoff(cap=10, base=1), 3)
-
-        # Initialize Redis connection with updated configuration
-        redis_conn = redis.from_url(
-            redis_url,
-            decode_responses=False,  # Required for RQ compatibility
-            socket_timeout=30,       # Updated as requested
-            socket_connect_timeout=20,  # Updated as requested
-            socket_keepalive=True,   # Added as requested
-            retry_on_timeout=True,
-            retry=retry,
-            health_check_interval=30
-        )
-        
-        # Test connection with retry logic
-        for attempt in range(3):
+        address = socket.getaddrinfo(host, int(port), type=socket.SOCK_STREAM)[0][4][0]
+    except (socket.gaierror, ValueError) as e:
+        logger.warning("Could not resolve Redis host %s, connecting by name: %s", host, e)
+        return host
+    logger.debug("Resolved Redis host %s to %s", host, address)
+    return address
+
+def _start_resolver(pool):
+    """Re-resolve REDIS_HOST from a daemon thread and reconnect when its address changes"""
+    def resolve_loop():
+        global _redis_address
+        while True:
+            time.sleep(RESOLVE_INTERVAL)
             try:
-                logger.info(f"Testing Redis connection (attempt {attempt + 1}/3)")
-                redis_conn.ping()
-                logger.info("Successfully connected to Redis")
-                break
-            except (RedisConnectionError, RedisTimeoutError) as e:
-                if attempt == 2:  # Last attempt
-                    logger.error(f"Failed to connect to Redis after 3 attempts: {str(e)}")
-                    raise
-                delay = min(2 ** attempt, 10)  # Exponential backoff capped at 10 seconds
-                logger.warning(f"Redis connection attempt {attempt + 1} failed, retrying in {delay} seconds...")
-                time.sleep(delay)
-        
-        # Initialize RQ queue with updated settings
-        queue = Queue(
-            name='twitter_bot_queue',
-            connection=redis_conn,
-            default_timeout=360,
-            job_timeout=180,
-            result_ttl=86400,  # Keep results for 1 day
-            failure_ttl=86400  # Keep failed jobs for 1 day
-        )
-        
+                address = _resolve_host(REDIS_HOST, REDIS_PORT)
+                if address == REDIS_HOST:
+                    continue  # Lookup failed; keep dialling the last known address
+                if address != _redis_address:
+                    logger.warning("Redis host %s moved from %s to %s, reconnecting",
+                                   REDIS_HOST, _redis_address, address)
+                    _redis_address = address
+                    # Dropped sockets reconnect to the new address on next use
+                    pool.disconnect()
+            except Exception as e:
+                logger.error("Redis resolver error: %s", e)
+
+    thread = threading.Thread(target=resolve_loop, name="redis-resolver", daemon=True)
+    thread.start()
+
+def _check_eviction_policy(config):
+    """Warn when Redis may evict keys, which would silently drop queued jobs"""
+    if isinstance(config, Exception):
+        # Managed Redis services often disable CONFIG; nothing to check then
+        logger.debug("Could not read Redis maxmemory-policy: %s", config)
+        return
+    policy = config.get(b'maxmemory-policy') or config.get('maxmemory-policy')
+    if isinstance(policy, bytes):
+        policy = policy.decode()
+    if policy and policy != 'noeviction':
+        logger.warning("Redis maxmemory-policy is '%s'; queued jobs may be evicted under memory pressure", policy)
+
+def init_queue(name='twitter_bot_queue'):
+    """Initialize Redis queue with proper error handling"""
+    queue = _queues.get(name)
+    if queue is not None:
         return queue
+
+    try:
+        with _init_lock:
+            if name not in _queues:
+                # Initialize RQ queue with updated settings
+                _queues[name] = Queue(
+                    name=name,
+                    connection=get_redis_connection(),
+                    default_timeout=360
+                )
+            return _queues[name]
                 
     except RedisConnectionError as e:
-        logger.error(f"Redis connection error: {str(e)}")
+        logger.error("Redis connection error: %s", e)
         raise
     except RedisTimeoutError as e:
-        logger.error(f"Redis timeout error: {str(e)}")
+        logger.error("Redis timeout error: %s", e)
         raise
     except Exception as e:
-        logger.error(f"Unexpected error initializing queue: {str(e)}")
+        logger.error("Unexpected error initializing queue: %s", e)
         raise
+
+async def init_queue_async(name='twitter_bot_queue'):
+    """Initialize a queue without blocking the event loop
+
+    RQ only works with the synchronous Redis client, so the handshake and its
+    retry sleeps run in a worker thread while the loop carries on.
+    """
+    return await asyncio.to_thread(init_queue, name)
@@ -5,8 +5,19 @@ document.addEventListener('DOMContentLoaded', function() {
         .then(data => {
             updateActivityChart(data);
             updateResponseChart(data);
+            updateQueueDepth(data);
         });
 
+    // Pending mention count, so queue saturation is visible early
+    function updateQueueDepth(data) {
+        const badge = document.getElementById('queueDepth');
+        if (data.queue_depth === null || data.queue_depth === undefined) {
+            badge.textContent = '';
+            return;
+        }
+        badge.textContent = `${data.queue_depth} pending`;
+    }
+
     // Activity Chart
     function updateActivityChart(data) {
         const ctx = document.getElementById('activityChart').getContext('2d');
@@ -0,0 +1,21 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Jobs are enqueued by reference to these module-level functions rather than
+# as TwitterBot bound methods, which RQ would have to pickle along with the
+# bot's locks, HTTP clients and Redis pool. Each job runs against the bot
+# instance of the process executing it.
+
+def _bot():
+    # Imported lazily: app imports bot, which imports this module
+    from app import bot
+    return bot
+
+def create_post(attempt=0):
+    """Generate and publish a scheduled post"""
+    _bot().create_post(attempt)
+
+def process_mention(tweet_id, user_handle, content):
+    """Draft and post the response to a queued mention"""
+    _bot().process_mention(tweet_id, user_handle, content)
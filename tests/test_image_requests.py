@@ -0,0 +1,40 @@
+import unittest
+
+try:
+    from bot import is_image_request
+except ImportError as e:  # bot pulls in tweepy, rq, openai, ...
+    raise unittest.SkipTest(f"bot dependencies not installed: {e}")
+
+# Figurative or negated wording that must go to OpenAI, not straight to Replicate
+NOT_IMAGE_REQUESTS = [
+    "show me how you handle gas fees",
+    "this will draw a lot of attention",
+    "can you illustrate your point",
+    "they paint a grim picture of the market",
+    "don't paint me as the villain",
+    "don't draw me into this argument",
+    "this will draw us closer",
+    "this should paint us a clearer picture",
+    "please do NOT make an image, just answer",
+]
+
+IMAGE_REQUESTS = [
+    "draw me a picture of a monkey",
+    "can you show me a picture of a bored ape",
+    "make an image of a cat",
+    "generate some images of apes",
+]
+
+class ImageRequestPatternTest(unittest.TestCase):
+    def test_figurative_and_negated_wording_is_not_an_image_request(self):
+        for text in NOT_IMAGE_REQUESTS:
+            with self.subTest(text=text):
+                self.assertFalse(is_image_request(text))
+
+    def test_explicit_requests_are_image_requests(self):
+        for text in IMAGE_REQUESTS:
+            with self.subTest(text=text):
+                self.assertTrue(is_image_request(text))
+
+if __name__ == "__main__":
+    unittest.main()
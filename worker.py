@@ -0,0 +1,30 @@
+import logging
+from rq import SimpleWorker
+from app import app, bot
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+class AppContextWorker(SimpleWorker):
+    """SimpleWorker that gives each job, and its callbacks, a fresh app context
+
+    Popping the context at the end of the job removes its database session, so
+    a failed transaction or a growing identity map never leaks into later jobs.
+    """
+
+    def perform_job(self, job, queue):
+        with app.app_context():
+            return super().perform_job(job, queue)
+
+if __name__ == "__main__":
+    # Queues are listed in priority order: mentions always drain before posts.
+    # Jobs run in this process instead of a fork per job, and the task functions
+    # call the bot created here, so its response caches, rendered context and
+    # HTTP pools survive between jobs
+    worker = AppContextWorker([bot.queue, bot.post_queue], connection=bot.queue.connection)
+    logger.info("Starting worker for queues: mentions, posts")
+    # The scheduler moves create_post retries queued with enqueue_in onto the queue when due
+    worker.work(with_scheduler=True)